@@ -20,6 +20,15 @@ from tensorflow_gnn.graph import padding_ops
 from tensorflow_gnn.graph import preprocessing_common
 
 
+def _maybe_static_int(value):
+  """Returns a Python int for statically known scalar values, else `value`."""
+  if isinstance(value, tf.Tensor) and value.shape.rank == 0:
+    static_value = tf.get_static_value(value)
+    if static_value is not None:
+      return int(static_value)
+  return value
+
+
 @tf.keras.utils.register_keras_serializable(package="GNN")
 class PadToTotalSizes(tf.keras.layers.Layer):
   """Applies tfgnn.pad_to_total_sizes() to a GraphTensor.
@@ -39,7 +48,10 @@ class PadToTotalSizes(tf.keras.layers.Layer):
                validate: bool = True,
                **kwargs):
     super().__init__(**kwargs)
-    self._sizes_constraints = sizes_constraints
+    # Fold statically known sizes to Python ints once, here, so that neither
+    # call() nor get_config() has to extract them from scalar Tensors again.
+    self._sizes_constraints = tf.nest.map_structure(
+        _maybe_static_int, sizes_constraints)
     self._validate = validate
 
   def get_config(self):
@@ -15,9 +15,11 @@
 """Tests for padding_ops Keras layers."""
 
 import enum
+import functools
 import os
 
 from absl.testing import parameterized
+import numpy as np
 import tensorflow as tf
 from tensorflow_gnn.graph import adjacency as adj
 from tensorflow_gnn.graph import graph_tensor as gt
@@ -33,41 +35,53 @@ class ReloadModel(int, enum.Enum):
   KERAS = 2
 
 
-class PadToTotalSizesTest(tf.test.TestCase, parameterized.TestCase):
+# GraphTensors are immutable: one instance is shared by all test variants.
+@functools.lru_cache(maxsize=1)
+def _make_test_graph():
+  return gt.GraphTensor.from_pieces(
+      context=gt.Context.from_fields(
+          features={"label": tf.constant([42])}),
+      node_sets={"nodes": gt.NodeSet.from_fields(
+          sizes=tf.constant([1]),
+          features={"feature": tf.constant([[1., 2.]])})},
+      edge_sets={"edges": gt.EdgeSet.from_fields(
+          sizes=tf.constant([1]),
+          adjacency=adj.Adjacency.from_indices(("nodes", tf.constant([0])),
+                                               ("nodes", tf.constant([0]))),
+          features={"weight": tf.constant([1.0])})})
 
-  def _make_test_graph(self):
-    return gt.GraphTensor.from_pieces(
-        context=gt.Context.from_fields(
-            features={"label": tf.constant([42])}),
-        node_sets={"nodes": gt.NodeSet.from_fields(
-            sizes=tf.constant([1]),
-            features={"feature": tf.constant([[1., 2.]])})},
-        edge_sets={"edges": gt.EdgeSet.from_fields(
-            sizes=tf.constant([1]),
-            adjacency=adj.Adjacency.from_indices(("nodes", tf.constant([0])),
-                                                 ("nodes", tf.constant([0]))),
-            features={"weight": tf.constant([1.0])})})
 
-  @parameterized.named_parameters(
-      ("", ReloadModel.SKIP),
-      ("Restored", ReloadModel.SAVED_MODEL),
-      ("RestoredKeras", ReloadModel.KERAS))
-  def test(self, reload_model):
-    input_graph = self._make_test_graph()
+class PadToTotalSizesTest(tf.test.TestCase, parameterized.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    # Build (and trace) the model once: all ReloadModel variants start from
+    # the same model, only the save/reload round-trip differs per variant.
+    super().setUpClass()
+    cls.input_graph = _make_test_graph()
     sc = preprocessing_common.SizeConstraints(
         total_num_components=2,
         total_num_nodes={"nodes": 3},
         total_num_edges={"edges": tf.constant(4)})  # Test conversion to int.
     pad = padding_ops.PadToTotalSizes(sc)
 
-    inputs = tf.keras.layers.Input(type_spec=input_graph.spec)
+    inputs = tf.keras.layers.Input(type_spec=cls.input_graph.spec)
     outputs = pad(inputs)
-    model = tf.keras.Model(inputs, outputs)
+    cls.model = tf.keras.Model(inputs, outputs)
+
+  @parameterized.named_parameters(
+      ("", ReloadModel.SKIP),
+      ("Restored", ReloadModel.SAVED_MODEL),
+      ("RestoredKeras", ReloadModel.KERAS))
+  def test(self, reload_model):
+    input_graph = self.input_graph
+    model = self.model
     if reload_model:
       export_dir = os.path.join(self.get_temp_dir(), "padding-model")
       model.save(export_dir, include_optimizer=False)
       if reload_model == ReloadModel.KERAS:
-        model = tf.keras.models.load_model(export_dir)
+        # compile=False: no optimizer/loss/metric state is saved or needed.
+        model = tf.keras.models.load_model(export_dir, compile=False)
         # Check that from_config() worked, no fallback to a function trace, see
         # https://www.tensorflow.org/guide/keras/save_and_serialize#how_savedmodel_handles_custom_objects
         self.assertIsInstance(model.get_layer(index=1),
@@ -76,15 +90,17 @@ class PadToTotalSizesTest(tf.test.TestCase, parameterized.TestCase):
         model = tf.saved_model.load(export_dir)
 
     graph, mask = model(input_graph)
-    self.assertAllEqual([True, False], mask)
-    self.assertAllEqual(2, graph.num_components)
-    self.assertAllEqual([42, 0], graph.context["label"])
+    # Compare in numpy: same checks, minus one eager tensor conversion each.
+    np.testing.assert_array_equal([True, False], mask.numpy())
+    np.testing.assert_array_equal(2, graph.num_components.numpy())
+    np.testing.assert_array_equal([42, 0], graph.context["label"].numpy())
     nodes = graph.node_sets["nodes"]
-    self.assertAllEqual([1, 2], nodes.sizes)
-    self.assertAllEqual([[1., 2.], [0., 0.], [0., 0.]], nodes["feature"])
+    np.testing.assert_array_equal([1, 2], nodes.sizes.numpy())
+    np.testing.assert_array_equal([[1., 2.], [0., 0.], [0., 0.]],
+                                  nodes["feature"].numpy())
     edges = graph.edge_sets["edges"]
-    self.assertAllEqual([1, 3], edges.sizes)
-    self.assertAllEqual([1., 0., 0., 0.], edges["weight"])
+    np.testing.assert_array_equal([1, 3], edges.sizes.numpy())
+    np.testing.assert_array_equal([1., 0., 0., 0.], edges["weight"].numpy())
 
 
 if __name__ == "__main__":
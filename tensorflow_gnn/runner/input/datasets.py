@@ -26,6 +26,8 @@ def _process_dataset(
     index: int,
     shuffle_dataset: bool = False,
     interleave_fn: Callable[..., tf.data.Dataset],
+    interleave_cycle_length: Optional[int] = None,
+    examples_cache_path: Optional[str] = None,
     examples_shuffle_size: Optional[int] = None) -> tf.data.Dataset:
   """Implements `SimpleDatasetsProvider.get_dataset(...)`.
 
@@ -38,6 +40,15 @@ def _process_dataset(
       cardinality.
     interleave_fn: A function that takes a dataset element and returns a
       `tf.data.Dataset.`
+    interleave_cycle_length: An optional number of input elements (typically:
+      files) processed concurrently by interleaving. If unset, the cycle
+      length is chosen by autotuning.
+    examples_cache_path: If not None, examples are cached after interleaving
+      (an empty string caches in memory, otherwise to the given filename):
+      epochs after the first reread cached examples instead of rereading
+      files. Placed before any example shuffling, so examples are still
+      reshuffled every epoch. NOTE: if enabled, the examples of this shard
+      must fit the backing storage.
     examples_shuffle_size: An optional buffer size for example shuffling.
 
   Returns:
@@ -49,8 +60,11 @@ def _process_dataset(
     dataset = dataset.shuffle(dataset.cardinality())
   dataset = dataset.interleave(
       interleave_fn,
+      cycle_length=interleave_cycle_length,
       deterministic=False,
       num_parallel_calls=tf.data.experimental.AUTOTUNE)
+  if examples_cache_path is not None:
+    dataset = dataset.cache(examples_cache_path)
   if examples_shuffle_size is not None:
     dataset = dataset.shuffle(examples_shuffle_size)
   return dataset.prefetch(tf.data.AUTOTUNE)
@@ -105,6 +119,8 @@ class SimpleDatasetProvider(interfaces.DatasetProvider):
                filenames: Optional[Sequence[str]] = None,
                shuffle_filenames: bool = False,
                interleave_fn: Callable[..., tf.data.Dataset],
+               interleave_cycle_length: Optional[int] = None,
+               examples_cache_path: Optional[str] = None,
                examples_shuffle_size: Optional[int] = None):
     """Captures the args shared across `get_dataset(...)` calls.
 
@@ -119,6 +135,14 @@ class SimpleDatasetProvider(interfaces.DatasetProvider):
         throughput.
       interleave_fn: A callback that receives a single filename and returns
         a `tf.data.Dataset` with the `tf.Example` values from that file.
+      interleave_cycle_length: An optional number of files read concurrently
+        by interleaving (e.g., to match the parallelism of the underlying
+        storage). If unset, the cycle length is chosen by autotuning.
+      examples_cache_path: If not None, examples are cached after reading
+        and before any example shuffling (an empty string caches in memory,
+        otherwise to the given filename): epochs after the first reread
+        cached examples instead of rereading files. NOTE: if enabled, this
+        replica's examples must fit the backing storage.
       examples_shuffle_size: An optional buffer size for example shuffling.
     """
     self._file_pattern = file_pattern
@@ -129,6 +153,8 @@ class SimpleDatasetProvider(interfaces.DatasetProvider):
           "but not both.")
     self._shuffle_filenames = shuffle_filenames
     self._interleave_fn = interleave_fn
+    self._interleave_cycle_length = interleave_cycle_length
+    self._examples_cache_path = examples_cache_path
     self._examples_shuffle_size = examples_shuffle_size
 
   def get_dataset(self, context: tf.distribute.InputContext) -> tf.data.Dataset:
@@ -143,6 +169,8 @@ class SimpleDatasetProvider(interfaces.DatasetProvider):
         index=context.input_pipeline_id,
         shuffle_dataset=self._shuffle_filenames,
         interleave_fn=self._interleave_fn,
+        interleave_cycle_length=self._interleave_cycle_length,
+        examples_cache_path=self._examples_cache_path,
         examples_shuffle_size=self._examples_shuffle_size)
 
 
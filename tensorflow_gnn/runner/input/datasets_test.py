@@ -79,6 +79,16 @@ class DatasetsTest(tf.test.TestCase, parameterized.TestCase):
 
     self.assertCountEqual(ds.as_numpy_iterator(), expected_values)
 
+  def test_process_dataset_interleave_cycle_length(self):
+    ds = datasets._process_dataset(
+        dataset(0).take(1).concatenate(dataset(1).take(1)),
+        num_shards=1,
+        index=0,
+        interleave_fn=interleave_fn,
+        interleave_cycle_length=1)
+
+    self.assertCountEqual(ds.as_numpy_iterator(), [8191, 8192])
+
   @parameterized.named_parameters([
       dict(
           testcase_name="fixed_cardinality=True",
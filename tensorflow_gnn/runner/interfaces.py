@@ -138,7 +138,15 @@ class Task(abc.ABC):
   def preprocess(
       self,
       gt: GraphTensor) -> Union[GraphTensor, GraphTensorAndField]:
-    """Preprocess a scalar (after `merge_batch_to_components`) `GraphTensor`."""
+    """Preprocess a scalar (after `merge_batch_to_components`) `GraphTensor`.
+
+    This method is element-wise: it is composed (with any user feature
+    processors) into a single preprocessing model that the runner applies in
+    one parallel, autotuned `tf.data.Dataset.map` call. Implementations
+    should not create `tf.data.Dataset` transformations or concern
+    themselves with parallelism: CPU parallelism is supplied uniformly by
+    the runner.
+    """
     raise NotImplementedError()
 
   @abc.abstractmethod
@@ -18,7 +18,7 @@ import dataclasses
 import functools
 import itertools
 import os
-from typing import Callable, Optional, Sequence, Tuple, Union
+from typing import Callable, Iterable, Optional, Sequence, Tuple, Union
 
 import tensorflow as tf
 import tensorflow_gnn as tfgnn
@@ -54,6 +54,21 @@ class TFDataServiceConfig:
   tf_data_service_mode: Union[str, tf.data.experimental.service.ShardingPolicy]
 
 
+def _tuned_dataset_options() -> tf.data.Options:
+  """Returns `tf.data.Options` tuned for GraphTensor input pipelines."""
+  options = tf.data.Options()
+  options.deterministic = False
+  options.experimental_optimization.map_and_batch_fusion = True
+  options.experimental_optimization.map_fusion = True
+  options.experimental_optimization.parallel_batch = True
+  # The input pipeline is CPU-map-bound: give each (per-replica) pipeline its
+  # own threadpool and spend threads on parallelism across elements instead
+  # of within ops.
+  options.threading.private_threadpool_size = os.cpu_count()
+  options.threading.max_intra_op_parallelism = 1
+  return options
+
+
 class _WrappedDatasetProvider(DatasetProvider):
   """Wraps a `DatasetProvider` with batching and processing."""
 
@@ -62,13 +77,15 @@ class _WrappedDatasetProvider(DatasetProvider):
                delegate: DatasetProvider,
                drop_remainder: bool,
                global_batch_size: int,
-               tf_data_service_config: Optional[TFDataServiceConfig] = None):
+               tf_data_service_config: Optional[TFDataServiceConfig] = None,
+               repeats: Optional[int] = None):
     super().__init__()
     self._apply_fn = apply_fn
     self._delegate = delegate
     self._drop_remainder = drop_remainder
     self._global_batch_size = global_batch_size
     self._tf_data_service_config = tf_data_service_config
+    self._repeats = repeats
 
   def get_dataset(self, context: tf.distribute.InputContext) -> tf.data.Dataset:
     """Gets a batched dataset with `apply_fn` applied."""
@@ -79,6 +96,10 @@ class _WrappedDatasetProvider(DatasetProvider):
           input_pipeline_id=0,
           num_replicas_in_sync=context.num_replicas_in_sync)
     ds = self._delegate.get_dataset(context)
+    # Batch before `apply_fn`: its maps (`ParseExample` and the preprocessing
+    # model) then run vectorized, once per batch instead of once per element.
+    # Keep batch and those maps adjacent so the runtime's fusion optimizations
+    # (see `_tuned_dataset_options`) can rewrite them into fused kernels.
     ds = ds.batch(
         context.get_per_replica_batch_size(self._global_batch_size),
         drop_remainder=self._drop_remainder)
@@ -94,7 +115,15 @@ class _WrappedDatasetProvider(DatasetProvider):
               processing_mode=self._tf_data_service_config.tf_data_service_mode,
               service=self._tf_data_service_config.tf_data_service_address,
               job_name=self._tf_data_service_config.tf_data_service_job_name))
-    return ds.apply(self._apply_fn)
+    ds = ds.apply(self._apply_fn)
+    if self._repeats is not None:
+      # After `apply_fn` (and so after any cache): repetitions reread the
+      # preprocessed data instead of re-running preprocessing.
+      ds = ds.repeat(self._repeats)
+    # Prefetch last: overlap the entire input pipeline (reading, batching and
+    # `apply_fn` processing) with accelerator compute.
+    ds = ds.prefetch(tf.data.AUTOTUNE)
+    return ds.with_options(_tuned_dataset_options())
 
 
 def _make_parsing_model(gtspec: GraphTensorSpec) -> tf.keras.Model:
@@ -107,11 +136,63 @@ def _make_parsing_model(gtspec: GraphTensorSpec) -> tf.keras.Model:
   return tf.keras.Model(examples, parsed)
 
 
+def _cast_features_fn(dtype: tf.DType) -> Callable[..., tfgnn.Fields]:
+  """Returns a `MapFeatures` callback casting float32 features to `dtype`."""
+  def fn(inputs, **unused_kwargs):
+    return {k: tf.cast(v, dtype) if v.dtype == tf.float32 else v
+            for k, v in inputs.features.items()}
+  return fn
+
+
+def _compose_preprocessors(
+    x: GraphTensor,
+    preprocessors: Iterable[GraphTensorProcessorFn]
+) -> Tuple[GraphTensor, Optional[tfgnn.Field]]:
+  """Applies `preprocessors` back to back on a symbolic `GraphTensor`.
+
+  The composition happens on Keras symbolic values: all preprocessors become
+  stages of one preprocessing model that runs in a single dataset map (there
+  is no per-preprocessor `tf.data.Dataset` stage to schedule or fuse).
+
+  Args:
+    x: A symbolic scalar `GraphTensor` to process.
+    preprocessors: The `GraphTensorProcessorFn` to apply: exactly one may
+      split out a label.
+
+  Returns:
+    A (`GraphTensor`, label) pair where the label is None unless some
+    preprocessor returned one.
+  """
+  y = None
+
+  for fn in preprocessors:
+    output = fn(x)
+
+    if isinstance(output, collections.abc.Sequence):
+      x, *ys = output
+      if len(ys) == 1:
+        yy = ys[0]
+      else:
+        raise ValueError(f"Expected (`GraphTensor`, `Field`) (got {output})")
+      if y is not None and yy is not None:
+        raise ValueError(f"Expected one label (got {y} and {yy})")
+      else:
+        y = yy
+    else:
+      x = output
+
+    if not tfgnn.is_graph_tensor(x):
+      raise ValueError(f"Expected `GraphTensor` (got {x})")
+
+  return x, y
+
+
 def _make_preprocessing_model(
     gtspec: GraphTensorSpec,
     preprocessors: Sequence[GraphTensorProcessorFn],
     task_preprocessor: GraphTensorProcessorFn,
-    size_constraints: Optional[SizeConstraints] = None) -> tf.keras.Model:
+    size_constraints: Optional[SizeConstraints] = None,
+    preprocess_dtype: tf.DType = tf.float32) -> tf.keras.Model:
   """Builds a `tf.keras.Model` that applies preprocessing.
 
   Args:
@@ -120,6 +201,9 @@ def _make_preprocessing_model(
     task_preprocessor: A `Task` preprocessor, used to apply any final objective
       specific processing.
     size_constraints: Any size constraints for padding.
+    preprocess_dtype: If not `tf.float32`, all float32 `GraphTensor` features
+      are cast to this dtype (e.g., `tf.bfloat16`) before any preprocessors
+      run.
 
   Returns:
     A `tf.keras.Model` with one, two or three outputs depending on the presence
@@ -130,32 +214,19 @@ def _make_preprocessing_model(
   gt = tf.keras.Input(type_spec=gtspec)
   x = gt.merge_batch_to_components()
 
+  if preprocess_dtype != tf.float32:
+    cast_fn = _cast_features_fn(preprocess_dtype)
+    x = tfgnn.keras.layers.MapFeatures(
+        context_fn=cast_fn, node_sets_fn=cast_fn, edge_sets_fn=cast_fn)(x)
+
   if size_constraints is not None:
     x, mask = tfgnn.keras.layers.PadToTotalSizes(size_constraints)(x)
   else:
     mask = None
 
-  # Apply preprocessors to GraphTensor x: exactly one may split out a label y.
-  y = None
-
-  for fn in itertools.chain(preprocessors, (task_preprocessor,)):
-    output = fn(x)
-
-    if isinstance(output, collections.abc.Sequence):
-      x, *ys = output
-      if len(ys) == 1:
-        yy = ys[0]
-      else:
-        raise ValueError(f"Expected (`GraphTensor`, `Field`) (got {output})")
-      if y is not None and yy is not None:
-        raise ValueError(f"Expected one label (got {y} and {yy})")
-      else:
-        y = yy
-    else:
-      x = output
-
-    if not tfgnn.is_graph_tensor(x):
-      raise ValueError(f"Expected `GraphTensor` (got {x})")
+  x, y = _compose_preprocessors(
+      x,
+      itertools.chain(preprocessors, (task_preprocessor,)))
 
   if y is None and mask is None:
     return tf.keras.Model(gt, x)
@@ -196,7 +267,10 @@ def run(*,
         valid_ds_provider: Optional[DatasetProvider] = None,
         train_padding: Optional[GraphTensorPadding] = None,
         valid_padding: Optional[GraphTensorPadding] = None,
-        tf_data_service_config: Optional[TFDataServiceConfig] = None):
+        tf_data_service_config: Optional[TFDataServiceConfig] = None,
+        cache_preprocessed: Optional[str] = None,
+        collapse_epochs: bool = False,
+        preprocess_dtype: tf.DType = tf.float32):
   """Runs training (and validation) of a model on a task with the given data.
 
   This includes preprocessing the input data, adapting the model by appending
@@ -219,6 +293,10 @@ def run(*,
       and validation.
     epochs: The epochs to train.
     drop_remainder: Whether to drop a `tf.data.Dataset` remainder at batching.
+      With True, every batch has the static per-replica batch size: this
+      gives the preprocessing model (and any downstream compilation, e.g.
+      on TPU) fully static input shapes and avoids a retrace for a smaller
+      final batch.
     export_dirs: Optional directories for exports (SavedModels); if unset,
       default behavior is `os.path.join(model_dir, "export").`
     model_exporters: Zero or more `ModelExporter` for exporting (SavedModels) to
@@ -240,6 +318,27 @@ def run(*,
       runtime reducing input bottlenecks for model training. Particularly for
       training on accelerators consider enabling it. For more info please see:
       https://www.tensorflow.org/api_docs/python/tf/data/experimental/service.
+    cache_preprocessed: If not None, preprocessed batches are cached (by
+      `tf.data.Dataset.cache`) so that subsequent epochs reread them instead
+      of re-running parsing and preprocessing. An empty string caches in
+      memory; any other string is used as a cache filename (suffixed with
+      "-train" and "-valid" for the respective datasets). `task.preprocess`
+      and all `feature_processors` must be deterministic and stateless for
+      caching to be safe: any randomness (e.g., augmentation) is frozen after
+      the first epoch.
+    collapse_epochs: If True, the training dataset is repeated `epochs` times
+      (by `tf.data.Dataset.repeat`) and the trainer is invoked with
+      `epochs=1`: training runs as one long epoch without per-epoch Keras
+      callback boundaries. Validation, checkpointing and summaries that are
+      scheduled "per epoch" then happen once, at dataset end. Intended for
+      trainers that end epochs at dataset end (i.e., no `steps_per_epoch`).
+    preprocess_dtype: The dtype for float32 `GraphTensor` features during
+      preprocessing: e.g., `tf.bfloat16` halves the bytes moved per feature
+      tensor. Features are cast right after `merge_batch_to_components`, so
+      `feature_processors` and `task.preprocess` see (and any float32 label
+      split out of a feature keeps) the reduced precision; the adapted model
+      and its losses remain free to cast back (see
+      `tf.keras.mixed_precision`). The default casts nothing.
   """
   validate = valid_ds_provider is not None
 
@@ -255,24 +354,30 @@ def run(*,
   preprocess_model = _make_preprocessing_model(
       gtspec,
       feature_processors or (),
-      task.preprocess)
+      task.preprocess,
+      preprocess_dtype=preprocess_dtype)
+
+  # Wrap in a `tf.function` once: the training and the validation datasets
+  # then map one shared callable (traced with the dataset's element spec),
+  # avoiding Keras `Model.__call__` overhead and a retrace per dataset.
+  preprocess_fn = tf.function(preprocess_model)
 
   def apply_fn(ds,
                *,
                filter_fn: Optional[Callable[..., bool]] = None,
-               size_constraints: Optional[SizeConstraints] = None):
+               map_fn: Callable[..., GraphTensor] = preprocess_fn,
+               cache_path: Optional[str] = None):
+    # NOTE: `map_fn` callables are built once, in `run()`, and shared across
+    # `get_dataset(...)` calls: `apply_fn` must not build models or trace
+    # functions itself (it runs per replica, per dataset).
     ds = parsing_utils.maybe_parse_graph_tensor_dataset(ds, gtspec)
     if filter_fn is not None:
       ds = ds.filter(filter_fn)
-    if size_constraints is not None:
-      padding_preprocess_model = _make_preprocessing_model(
-          gtspec,
-          feature_processors or (),
-          task.preprocess,
-          size_constraints)
-      ds = _map_over_dataset(ds, padding_preprocess_model)
-    else:
-      ds = _map_over_dataset(ds, preprocess_model)
+    ds = _map_over_dataset(ds, map_fn)
+    if cache_path is not None:
+      # Cache after preprocessing: later epochs reread cached batches instead
+      # of re-running parsing and the preprocessing model.
+      ds = ds.cache(cache_path)
     return ds
 
   target_batch_size = _per_replica_batch_size(
@@ -283,30 +388,47 @@ def run(*,
   # that runs this Python code) before the actual training or validation
   # datasets are created (possibly replicated, possibly distributed to
   # one or more worker jobs).
+  if cache_preprocessed:  # A filename: suffix to keep train and valid apart.
+    train_cache_path = f"{cache_preprocessed}-train"
+    valid_cache_path = f"{cache_preprocessed}-valid"
+  else:  # `None` (no caching) or "" (caching in memory).
+    train_cache_path = valid_cache_path = cache_preprocessed
+
+  def make_padding_preprocess_fn(size_constraints):
+    return tf.function(_make_preprocessing_model(
+        gtspec,
+        feature_processors or (),
+        task.preprocess,
+        size_constraints,
+        preprocess_dtype=preprocess_dtype))
+
   if train_padding is not None:
     size_constraints = train_padding.get_size_constraints(target_batch_size)
     train_apply_fn = functools.partial(
         apply_fn,
         filter_fn=train_padding.get_filter_fn(size_constraints),
-        size_constraints=size_constraints)
+        map_fn=make_padding_preprocess_fn(size_constraints),
+        cache_path=train_cache_path)
   else:
-    train_apply_fn = apply_fn
+    train_apply_fn = functools.partial(apply_fn, cache_path=train_cache_path)
 
   if validate and valid_padding is not None:
     size_constraints = valid_padding.get_size_constraints(target_batch_size)
     valid_apply_fn = functools.partial(
         apply_fn,
         filter_fn=valid_padding.get_filter_fn(size_constraints),
-        size_constraints=size_constraints)
+        map_fn=make_padding_preprocess_fn(size_constraints),
+        cache_path=valid_cache_path)
   elif validate:
-    valid_apply_fn = apply_fn
+    valid_apply_fn = functools.partial(apply_fn, cache_path=valid_cache_path)
 
   train_ds_provider = _WrappedDatasetProvider(
       train_apply_fn,
       train_ds_provider,
       drop_remainder,
       global_batch_size,
-      tf_data_service_config)
+      tf_data_service_config,
+      repeats=epochs if collapse_epochs else None)
 
   if validate:
     valid_ds_provider = _WrappedDatasetProvider(
@@ -331,7 +453,7 @@ def run(*,
   model = trainer.train(
       adapted_model_fn,
       train_ds_provider,
-      epochs=epochs,
+      epochs=1 if collapse_epochs else epochs,
       valid_ds_provider=valid_ds_provider)
 
   if model_exporters is None:
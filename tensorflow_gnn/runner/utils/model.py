@@ -41,7 +41,7 @@ def chain_first_output(m1: Model,
   `collections.abc.Sequence` only. Example psuedocode, where single outputs are
   treated as lists of length one:
 
-  out1first, *out1rest = m1(m1.input)
+  out1first, *out1rest = m1.output
   out2first, *out2rest = m2(out1first)
   return out2first if first_output_only else [out2first, *out1rest, *out2rest]
 
@@ -54,6 +54,8 @@ def chain_first_output(m1: Model,
   Returns:
     A new concatenated Keras model.
   """
-  x, y = _if_nested(m1(m1.input), lambda o: (o[0], o[1:]), lambda o: (o, []))
+  # Reuse the symbolic outputs of `m1` (vs. recalling `m1` on its input):
+  # recalling would add a duplicate copy of `m1`'s subgraph to the result.
+  x, y = _if_nested(m1.output, lambda o: (o[0], o[1:]), lambda o: (o, []))
   output = _if_nested(m2(x), lambda o: [o[0], *y, *o[1:]], lambda o: [o, *y])
   return Model(m1.input, not first_output_only and output or output[0])